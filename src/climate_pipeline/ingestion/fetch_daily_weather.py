@@ -125,6 +125,18 @@ def build_parser() -> argparse.ArgumentParser:
         help="End date for backfill (YYYY-MM-DD). If omitted, uses settings.yaml time_window.end_date.",
     )
 
+    parser.add_argument(
+        "--city-id",
+        dest="city_ids",
+        type=int,
+        action="append",
+        default=None,
+        help=(
+            "Only ingest this city_id from dim_city.csv (repeatable). "
+            "Used to fan backfills out per city. Default: all cities."
+        ),
+    )
+
     # Optional: allow overriding the settings path
     parser.add_argument(
         "--settings-path",
@@ -305,77 +317,76 @@ def run_backfill(
 
     daily_vars: List[str] = settings["open_meteo"]["daily_variables"]
 
-    client = OpenMeteoClient(
+    with OpenMeteoClient(
         geocoding_base_url=settings["open_meteo"]["geocoding_base_url"],
         historical_base_url=settings["open_meteo"]["historical_base_url"],
-    )
+    ) as client:
+        years = year_range(start_date, end_date)
+        logger.info("Backfill mode: fetching daily data for years: %s", years)
 
-    years = year_range(start_date, end_date)
-    logger.info("Backfill mode: fetching daily data for years: %s", years)
+        total_requests = 0
+        successes = 0
+        failures = 0
+        failed_cities: set[str] = set()
 
-    total_requests = 0
-    successes = 0
-    failures = 0
-    failed_cities: set[str] = set()
+        for city in cities:
+            city_slug = slugify_city_name(city.city_name)
+            city_dir = raw_weather_dir / city_slug
+            city_dir.mkdir(parents=True, exist_ok=True)
 
-    for city in cities:
-        city_slug = slugify_city_name(city.city_name)
-        city_dir = raw_weather_dir / city_slug
-        city_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(
+                "Starting downloads for city_id=%s name=%s",
+                city.city_id,
+                city.city_name,
+            )
 
-        logger.info(
-            "Starting downloads for city_id=%s name=%s",
-            city.city_id,
-            city.city_name,
-        )
+            for year in years:
+                year_start, year_end = clamp_year_window(start_date, end_date, year)
+                if year_start > year_end:
+                    continue  # outside global window
+
+                out_path = city_dir / f"{year}.json"
+                if out_path.exists():
+                    logger.info(
+                        "Skipping existing file for %s %s: %s",
+                        city.city_name,
+                        year,
+                        out_path,
+                    )
+                    continue
+
+                total_requests += 1
+
+                data, n_records = fetch_daily_with_retries(
+                    client=client,
+                    city=city,
+                    start_date=year_start,
+                    end_date=year_end,
+                    daily_vars=daily_vars,
+                    logger=logger,
+                    max_retries=max_retries,
+                    base_delay=base_delay,
+                )
+
+                if data is None:
+                    failures += 1
+                    failed_cities.add(city.city_name)
+                    continue
 
-        for year in years:
-            year_start, year_end = clamp_year_window(start_date, end_date, year)
-            if year_start > year_end:
-                continue  # outside global window
+                with open(out_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
 
-            out_path = city_dir / f"{year}.json"
-            if out_path.exists():
                 logger.info(
-                    "Skipping existing file for %s %s: %s",
+                    "Wrote %s (%d daily records) for city=%s year=%s",
+                    out_path,
+                    n_records,
                     city.city_name,
                     year,
-                    out_path,
                 )
-                continue
 
-            total_requests += 1
-
-            data, n_records = fetch_daily_with_retries(
-                client=client,
-                city=city,
-                start_date=year_start,
-                end_date=year_end,
-                daily_vars=daily_vars,
-                logger=logger,
-                max_retries=max_retries,
-                base_delay=base_delay,
-            )
-
-            if data is None:
-                failures += 1
-                failed_cities.add(city.city_name)
-                continue
-
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            logger.info(
-                "Wrote %s (%d daily records) for city=%s year=%s",
-                out_path,
-                n_records,
-                city.city_name,
-                year,
-            )
-
-            # Small pause between requests
-            time.sleep(0.5)
-            successes += 1
+                # Small pause between requests
+                time.sleep(0.5)
+                successes += 1
 
     return IngestionSummary(
         mode="backfill",
@@ -412,11 +423,6 @@ def run_recent(
 
     daily_vars: List[str] = settings["open_meteo"]["daily_variables"]
 
-    client = OpenMeteoClient(
-        geocoding_base_url=settings["open_meteo"]["geocoding_base_url"],
-        historical_base_url=settings["open_meteo"]["historical_base_url"],
-    )
-
     today = date.today()
     current_year = today.year
 
@@ -440,58 +446,62 @@ def run_recent(
             failed_cities=[],
         )
 
-    logger.info(
-        "Recent mode: fetching year-to-date data for current year %s (%s → %s)",
-        current_year,
-        year_start,
-        end_date,
-    )
+    with OpenMeteoClient(
+        geocoding_base_url=settings["open_meteo"]["geocoding_base_url"],
+        historical_base_url=settings["open_meteo"]["historical_base_url"],
+    ) as client:
+        logger.info(
+            "Recent mode: fetching year-to-date data for current year %s (%s → %s)",
+            current_year,
+            year_start,
+            end_date,
+        )
 
-    total_requests = 0
-    successes = 0
-    failures = 0
-    failed_cities: set[str] = set()
+        total_requests = 0
+        successes = 0
+        failures = 0
+        failed_cities: set[str] = set()
 
-    for city in cities:
-        city_slug = slugify_city_name(city.city_name)
-        city_dir = raw_weather_dir / city_slug
-        city_dir.mkdir(parents=True, exist_ok=True)
+        for city in cities:
+            city_slug = slugify_city_name(city.city_name)
+            city_dir = raw_weather_dir / city_slug
+            city_dir.mkdir(parents=True, exist_ok=True)
 
-        out_path = city_dir / f"{current_year}.json"
+            out_path = city_dir / f"{current_year}.json"
 
-        total_requests += 1
+            total_requests += 1
 
-        data, n_records = fetch_daily_with_retries(
-            client=client,
-            city=city,
-            start_date=year_start,
-            end_date=end_date,
-            daily_vars=daily_vars,
-            logger=logger,
-            max_retries=max_retries,
-            base_delay=base_delay,
-        )
+            data, n_records = fetch_daily_with_retries(
+                client=client,
+                city=city,
+                start_date=year_start,
+                end_date=end_date,
+                daily_vars=daily_vars,
+                logger=logger,
+                max_retries=max_retries,
+                base_delay=base_delay,
+            )
 
-        if data is None:
-            failures += 1
-            failed_cities.add(city.city_name)
-            continue
+            if data is None:
+                failures += 1
+                failed_cities.add(city.city_name)
+                continue
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(out_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
 
-        logger.info(
-            "Recent mode: wrote %s (%d daily records) for city_id=%s name=%s year=%s",
-            out_path,
-            n_records,
-            city.city_id,
-            city.city_name,
-            current_year,
-        )
+            logger.info(
+                "Recent mode: wrote %s (%d daily records) for city_id=%s name=%s year=%s",
+                out_path,
+                n_records,
+                city.city_id,
+                city.city_name,
+                current_year,
+            )
 
-        # Small pause between cities
-        time.sleep(0.5)
-        successes += 1
+            # Small pause between cities
+            time.sleep(0.5)
+            successes += 1
 
     return IngestionSummary(
         mode="recent",
@@ -540,6 +550,14 @@ def main() -> None:
     cities = load_cities_from_dim_city(str(dim_city_path))
     logger.info("Loaded %d cities from dim_city.csv", len(cities))
 
+    if args.city_ids:
+        wanted = set(args.city_ids)
+        cities = [c for c in cities if c.city_id in wanted]
+        if not cities:
+            logger.error("No cities in dim_city.csv match --city-id %s.", args.city_ids)
+            sys.exit(1)
+        logger.info("Restricted to %d city/cities via --city-id", len(cities))
+
     if args.mode == "backfill":
         # Use CLI dates if given, otherwise fall back to settings.yaml
         if args.start_date is not None:
@@ -591,6 +609,11 @@ def main() -> None:
     # Print JSON summary to stdout for Prefect or other callers to parse if desired
     print(json.dumps(summary.__dict__, default=str))
 
+    # A per-city run (--city-id) whose files are all on disk already simply
+    # had nothing to do; that is not a failure.
+    if args.city_ids and summary.total_requests == 0:
+        return
+
     # Exit code: non-zero only if *all* requests failed or no successful requests
     if summary.total_requests == 0 or summary.successes == 0:
         logger.error(
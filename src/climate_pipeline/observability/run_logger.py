@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, date, timezone
+from datetime import datetime, date
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
 import os
+import sys
 import duckdb
 
 
@@ -23,7 +25,12 @@ DEFAULT_WAREHOUSE_PATH = PROJECT_ROOT / "data" / "warehouse" / "climate.duckdb"
 # Data classes
 # ==========================
 
-@dataclass
+# Records are immutable once built. slots=True is only available on 3.10+,
+# so older interpreters fall back to frozen-only dataclasses.
+_RECORD_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
+
+
+@dataclass(**_RECORD_OPTIONS)
 class PipelineRunRecord:
     """
     Single pipeline run record that will be inserted into pipeline_run_log.
@@ -43,7 +50,7 @@ class PipelineRunRecord:
     freshness_status: str
 
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class MLMetricRecord:
     """
     Single ML training/eval run metrics.
@@ -84,7 +91,7 @@ class MLMetricRecord:
     created_at: datetime
 
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class PipelineRunStats:
     """
     Computed statistics for the *current* run, before we write the record.
@@ -98,6 +105,118 @@ class PipelineRunStats:
     freshness_status: str
 
 
+# ==========================
+# Observability DDL
+# ==========================
+
+# 1) Pipeline run log (already used)
+_DDL_RUN_LOG = """
+CREATE TABLE IF NOT EXISTS pipeline_run_log (
+    id BIGINT,
+    flow_name TEXT,
+    run_mode TEXT,
+    status TEXT,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    rows_bronze BIGINT,
+    rows_gold_ml BIGINT,
+    rows_bronze_delta BIGINT,
+    rows_gold_ml_delta BIGINT,
+    bronze_max_date DATE,
+    gold_ml_max_date DATE,
+    freshness_status TEXT
+)
+"""
+
+# 2) ML metrics table
+_DDL_ML_METRICS = """
+CREATE TABLE IF NOT EXISTS pipeline_ml_metrics (
+    id BIGINT,
+    pipeline_run_id BIGINT,     -- optional FK to pipeline_run_log.id
+
+    flow_name TEXT,
+    run_mode TEXT,
+    model_name TEXT,
+    model_version TEXT,
+
+    train_size BIGINT,
+    test_size BIGINT,
+    positive_class_ratio DOUBLE,
+
+    accuracy DOUBLE,
+    roc_auc DOUBLE,
+
+    precision_0 DOUBLE,
+    recall_0 DOUBLE,
+    f1_0 DOUBLE,
+
+    precision_1 DOUBLE,
+    recall_1 DOUBLE,
+    f1_1 DOUBLE,
+
+    created_at TIMESTAMP
+)
+"""
+
+
+# ==========================
+# INSERT parameter getters
+# ==========================
+
+# Column order must match the INSERT statements below (the id is computed in SQL).
+_RUN_ATTRS = attrgetter(
+    "flow_name",
+    "run_mode",
+    "status",
+    "started_at",
+    "finished_at",
+    "rows_bronze",
+    "rows_gold_ml",
+    "rows_bronze_delta",
+    "rows_gold_ml_delta",
+    "bronze_max_date",
+    "gold_ml_max_date",
+    "freshness_status",
+)
+
+_ML_CONTEXT_ATTRS = attrgetter(
+    "pipeline_run_id",
+    "flow_name",
+    "run_mode",
+    "model_name",
+    "model_version",
+)
+
+_ML_SIZE_ATTRS = attrgetter("train_size", "test_size")
+
+# roc_auc sits between these two groups and is the only score that may be None.
+_ML_HEAD_SCORE_ATTRS = attrgetter("positive_class_ratio", "accuracy")
+
+_ML_CLASS_SCORE_ATTRS = attrgetter(
+    "precision_0",
+    "recall_0",
+    "f1_0",
+    "precision_1",
+    "recall_1",
+    "f1_1",
+)
+
+
+def _ml_metric_params(record: MLMetricRecord) -> tuple:
+    """
+    Build the pipeline_ml_metrics INSERT parameters (without id), coercing
+    sizes to int and scores to float. Only roc_auc may be None.
+    """
+    return (
+        *_ML_CONTEXT_ATTRS(record),
+        *map(int, _ML_SIZE_ATTRS(record)),
+        *map(float, _ML_HEAD_SCORE_ATTRS(record)),
+        float(record.roc_auc) if record.roc_auc is not None else None,
+        *map(float, _ML_CLASS_SCORE_ATTRS(record)),
+        record.created_at,
+    )
+
+
 # ==========================
 # Helpers
 # ==========================
@@ -129,73 +248,8 @@ def _ensure_schema(conn: duckdb.DuckDBPyConnection) -> None:
     - It DOES NOT open or close the connection.
     - It must NOT change connection state beyond creating tables.
     """
-    # ---------------------------------
-    # 1) Pipeline run log (already used)
-    # ---------------------------------
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS pipeline_run_log (
-            id BIGINT,
-            flow_name TEXT,
-            run_mode TEXT,
-            status TEXT,
-            started_at TIMESTAMP,
-            finished_at TIMESTAMP,
-            rows_bronze BIGINT,
-            rows_gold_ml BIGINT,
-            rows_bronze_delta BIGINT,
-            rows_gold_ml_delta BIGINT,
-            bronze_max_date DATE,
-            gold_ml_max_date DATE,
-            freshness_status TEXT
-        )
-        """
-    )
-
-    # ---------------------------------
-    # 2) ML metrics table
-    # ---------------------------------
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS pipeline_ml_metrics (
-            id BIGINT,
-            pipeline_run_id BIGINT,     -- optional FK to pipeline_run_log.id
-
-            flow_name TEXT,
-            run_mode TEXT,
-            model_name TEXT,
-            model_version TEXT,
-
-            train_size BIGINT,
-            test_size BIGINT,
-            positive_class_ratio DOUBLE,
-
-            accuracy DOUBLE,
-            roc_auc DOUBLE,
-
-            precision_0 DOUBLE,
-            recall_0 DOUBLE,
-            f1_0 DOUBLE,
-
-            precision_1 DOUBLE,
-            recall_1 DOUBLE,
-            f1_1 DOUBLE,
-
-            created_at TIMESTAMP
-        )
-        """
-    )
-
-
-def _compute_next_id(conn: duckdb.DuckDBPyConnection, table_name: str) -> int:
-    """
-    Compute the next ID for a table in a simple, concurrency-safe way
-    (enough for local and single-process usage).
-    """
-    row = conn.execute(
-        f"SELECT COALESCE(MAX(id) + 1, 1) FROM {table_name}"
-    ).fetchone()
-    return int(row[0])
+    conn.execute(_DDL_RUN_LOG)
+    conn.execute(_DDL_ML_METRICS)
 
 
 # ==========================
@@ -215,64 +269,78 @@ def compute_run_stats(warehouse_path: Optional[Path] = None) -> PipelineRunStats
     try:
         _ensure_schema(conn)
 
+        # --- Previous successful run (for deltas and freshness pruning) ---
+        last_success = conn.execute(
+            """
+            SELECT
+                rows_bronze,
+                rows_gold_ml,
+                bronze_max_date
+            FROM pipeline_run_log
+            WHERE status = 'success'
+            ORDER BY started_at DESC
+            LIMIT 1
+            """
+        ).fetchone()
+        prev_bronze_max_date = last_success[2] if last_success is not None else None
+
         # --- Current row counts ---
+        # A bare COUNT(*) reads row-group metadata only, no column data.
         rows_bronze = conn.execute(
             'SELECT COUNT(*) FROM "main"."landing_daily_weather"'
         ).fetchone()[0]
 
-        rows_gold_ml = conn.execute(
-            'SELECT COUNT(*) FROM "main"."ml_features"'
-        ).fetchone()[0]
-
         # --- Max dates for freshness ---
 
-        # bronze: real daily date column
-        bronze_max_date = conn.execute(
-            'SELECT MAX(date) FROM "main"."landing_daily_weather"'
-        ).fetchone()[0]
-
-        # gold_ml: monthly features → derive a date from (year, month)
-        latest_month_row = conn.execute(
+        # bronze: real daily date column; lag is computed against the
+        # warehouse clock so orchestrator/DB clock skew can't leak in.
+        # Landing only grows forward in time, so starting from the last
+        # run's max date lets DuckDB skip older row groups via zonemaps; if
+        # nothing qualifies (e.g. the table was rebuilt) fall back to a
+        # full scan.
+        bronze_freshness_sql = """
+            SELECT
+                MAX(date),
+                date_diff('day', MAX(date), CURRENT_DATE)
+            FROM "main"."landing_daily_weather"
+        """
+        bronze_max_date, lag_days = None, None
+        if prev_bronze_max_date is not None:
+            bronze_max_date, lag_days = conn.execute(
+                bronze_freshness_sql + " WHERE date >= ?",
+                [prev_bronze_max_date],
+            ).fetchone()
+        if bronze_max_date is None:
+            bronze_max_date, lag_days = conn.execute(bronze_freshness_sql).fetchone()
+
+        # gold_ml: monthly features → derive a date from the latest
+        # (year, month), encoded as a month index so MAX finds it
+        rows_gold_ml, latest_month_index = conn.execute(
             """
-            SELECT year, month
+            SELECT
+                COUNT(*),
+                MAX(year * 12 + (month - 1))
             FROM "main"."ml_features"
-            ORDER BY year DESC, month DESC
-            LIMIT 1
             """
         ).fetchone()
 
-        if latest_month_row is not None:
-            latest_year, latest_month = latest_month_row
-            gold_ml_max_date = date(int(latest_year), int(latest_month), 1)
+        if latest_month_index is not None:
+            latest_year, latest_month0 = divmod(int(latest_month_index), 12)
+            gold_ml_max_date = date(latest_year, latest_month0 + 1, 1)
         else:
             gold_ml_max_date = None
 
-        # --- Previous successful run (for deltas) ---
-        last_success = conn.execute(
-            """
-            SELECT
-                rows_bronze,
-                rows_gold_ml
-            FROM pipeline_run_log
-            WHERE status = 'success'
-            ORDER BY started_at DESC
-            LIMIT 1
-            """
-        ).fetchone()
-
         if last_success is None:
             rows_bronze_delta = rows_bronze
             rows_gold_ml_delta = rows_gold_ml
         else:
-            prev_rows_bronze, prev_rows_gold_ml = last_success
+            prev_rows_bronze, prev_rows_gold_ml, _ = last_success
             rows_bronze_delta = rows_bronze - int(prev_rows_bronze)
             rows_gold_ml_delta = rows_gold_ml - int(prev_rows_gold_ml)
 
         # --- Freshness status (based on landing_daily_weather) ---
         freshness_status = "unknown"
-        if bronze_max_date is not None:
-            today = datetime.now(timezone.utc).date()
-            lag_days = (today - bronze_max_date).days
+        if lag_days is not None:
             if lag_days <= 1:
                 freshness_status = "fresh"
             elif lag_days <= 7:
@@ -296,9 +364,12 @@ def compute_run_stats(warehouse_path: Optional[Path] = None) -> PipelineRunStats
 def log_pipeline_run(
     record: PipelineRunRecord,
     warehouse_path: Optional[Path] = None,
-) -> None:
+) -> int:
     """
-    Insert a PipelineRunRecord into pipeline_run_log.
+    Insert a PipelineRunRecord into pipeline_run_log and return its id.
+
+    The id is computed inline as MAX(id) + 1 within the INSERT itself, so
+    allocation and write happen in a single statement.
 
     If anything goes wrong here, callers SHOULD catch exceptions so that
     logging failures don't break the main pipeline.
@@ -309,9 +380,8 @@ def log_pipeline_run(
     conn = duckdb.connect(str(db_path))
     try:
         _ensure_schema(conn)
-        next_id = _compute_next_id(conn, "pipeline_run_log")
 
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO pipeline_run_log (
                 id,
@@ -328,24 +398,15 @@ def log_pipeline_run(
                 gold_ml_max_date,
                 freshness_status
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            SELECT
+                COALESCE(MAX(id), 0) + 1,
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            FROM pipeline_run_log
+            RETURNING id
             """,
-            [
-                next_id,
-                record.flow_name,
-                record.run_mode,
-                record.status,
-                record.started_at,
-                record.finished_at,
-                record.rows_bronze,
-                record.rows_gold_ml,
-                record.rows_bronze_delta,
-                record.rows_gold_ml_delta,
-                record.bronze_max_date,
-                record.gold_ml_max_date,
-                record.freshness_status,
-            ],
-        )
+            _RUN_ATTRS(record),
+        ).fetchone()
+        return int(row[0])
     finally:
         conn.close()
 
@@ -353,9 +414,9 @@ def log_pipeline_run(
 def log_ml_metrics(
     record: MLMetricRecord,
     warehouse_path: Optional[Path] = None,
-) -> None:
+) -> int:
     """
-    Insert a single MLMetricRecord into pipeline_ml_metrics.
+    Insert a single MLMetricRecord into pipeline_ml_metrics and return its id.
     """
     db_path = _get_warehouse_path(warehouse_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -364,9 +425,7 @@ def log_ml_metrics(
     try:
         _ensure_schema(conn)
 
-        next_id = _compute_next_id(conn, "pipeline_ml_metrics")
-
-        conn.execute(
+        row = conn.execute(
             """
             INSERT INTO pipeline_ml_metrics (
                 id,
@@ -388,28 +447,14 @@ def log_ml_metrics(
                 f1_1,
                 created_at
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            SELECT
+                COALESCE(MAX(id), 0) + 1,
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            FROM pipeline_ml_metrics
+            RETURNING id
             """,
-            [
-                int(next_id),
-                record.pipeline_run_id,
-                record.flow_name,
-                record.run_mode,
-                record.model_name,
-                record.model_version,
-                int(record.train_size),
-                int(record.test_size),
-                float(record.positive_class_ratio),
-                float(record.accuracy),
-                float(record.roc_auc) if record.roc_auc is not None else None,
-                float(record.precision_0),
-                float(record.recall_0),
-                float(record.f1_0),
-                float(record.precision_1),
-                float(record.recall_1),
-                float(record.f1_1),
-                record.created_at,
-            ],
-        )
+            _ml_metric_params(record),
+        ).fetchone()
+        return int(row[0])
     finally:
         conn.close()
\ No newline at end of file
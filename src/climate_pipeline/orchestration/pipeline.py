@@ -1,7 +1,6 @@
 import subprocess
 import sys
 from pathlib import Path
-import time
 import argparse
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
@@ -32,8 +31,8 @@ def check_db_lock():
         print(f"⚠ Database not found: {DB_PATH}")
         return
 
-    # Give DuckDB / Python a moment to release locks
-    time.sleep(1)
+    # The ingestion step runs in its own subprocess, so its DuckDB lock is
+    # already released by the time it exits; no need to wait before dbt.
     print(f"✅ Using DuckDB at: {DB_PATH}")
 
 
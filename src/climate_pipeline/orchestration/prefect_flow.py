@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
+import selectors
+import shlex
 import subprocess
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
 
-from prefect import flow, task, get_run_logger
+from dbt.cli.main import dbtRunner, dbtRunnerResult
+from prefect import allow_failure, flow, task, get_run_logger, unmapped
+from prefect.futures import PrefectFuture
+from prefect.task_runners import ThreadPoolTaskRunner
 
+from climate_pipeline.ingestion.fetch_daily_weather import load_cities_from_dim_city
 from climate_pipeline.observability.run_logger import (
     PipelineRunRecord,
     log_pipeline_run,
@@ -31,17 +44,59 @@ DATA_DIR = get_data_root()
 LOGS_DIR = get_log_root()
 WAREHOUSE_PATH = get_duckdb_path()
 DBT_DIR = PROJECT_ROOT / "dbt"
+DIM_CITY_PATH = DBT_DIR / "seeds" / "dim_city.csv"
+
+
+# ==========================
+# Commands
+# ==========================
+
+# The flow already runs inside the project environment, so invoke entrypoint
+# modules with the current interpreter instead of paying `uv run` startup
+# (environment resolution + lockfile check) on every subprocess.
+FETCH_DAILY_WEATHER = [sys.executable, "-m", "climate_pipeline.ingestion.fetch_daily_weather"]
+CLIMATE_TRAIN_BASELINE = [sys.executable, "-m", "climate_pipeline.ml.train"]
+PYTEST = [sys.executable, "-m", "pytest"]
+WORKER = [sys.executable, "-m", "climate_pipeline.orchestration.worker"]
+
+# Entrypoints that can run either inside the long-lived worker (default) or,
+# with CLIMATE_PIPELINE_WORKER=0, as one subprocess per task.
+ENTRYPOINTS: Dict[str, list[str]] = {
+    "fetch-daily-weather": FETCH_DAILY_WEATHER,
+    "climate-train-baseline": CLIMATE_TRAIN_BASELINE,
+    "pytest": PYTEST,
+}
+USE_WORKER = os.getenv("CLIMATE_PIPELINE_WORKER", "1") != "0"
+
+# pytest runs in-process (inside the warm worker) by default; set
+# CLIMATE_PYTEST_SUBPROCESS=1 to run it in a fresh interpreter for full
+# isolation from previously imported modules.
+PYTEST_ARGS = ["-q", "--rootdir", str(PROJECT_ROOT), str(PROJECT_ROOT / "tests")]
+PYTEST_SUBPROCESS = os.getenv("CLIMATE_PYTEST_SUBPROCESS", "0") == "1"
+
+# On failure, the last OUTPUT_TAIL_LINES lines of a command's output are
+# repeated in one ERROR record, capped at MAX_LOG_CHUNK characters (as are
+# individual streamed lines) so no single log record grows unbounded.
+OUTPUT_TAIL_LINES = 200
+MAX_LOG_CHUNK = 16 * 1024
+
+# Open-Meteo fair use: never run more than this many per-city backfill
+# fetches at once. Tasks hitting the API are tagged so a Prefect
+# concurrency limit can enforce the same cap across flow runs.
+OPEN_METEO_TAG = "open-meteo"
+OPEN_METEO_MAX_CONCURRENCY = 5
 
 
 # ==========================
 # Subprocess helpers
 # ==========================
 
-def build_subprocess_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+@lru_cache(maxsize=1)
+def _get_base_env() -> Dict[str, str]:
     """
-    Build an environment dict for subprocesses that ensures
-    all critical path-related env vars are absolute and consistent,
-    regardless of how .env was defined.
+    os.environ plus the project's path and Open-Meteo settings, computed
+    once and shared by every subprocess of a flow run. Each flow clears the
+    cache on entry so environment changes between runs still apply.
     """
     env = os.environ.copy()
 
@@ -66,12 +121,97 @@ def build_subprocess_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, st
         "https://archive-api.open-meteo.com/v1/archive",
     )
 
-    if extra:
-        env.update(extra)
-
     return env
 
 
+def build_subprocess_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Build an environment dict for subprocesses that ensures
+    all critical path-related env vars are absolute and consistent,
+    regardless of how .env was defined.
+
+    Returns a fresh dict: the memoized base env with `extra` layered on top.
+    """
+    return {**_get_base_env(), **(extra or {})}
+
+
+def _log_command_header(logger, description: str, argv: list[str], suffix: str) -> None:
+    """
+    Log the banner that precedes every command, as "$ <argv> <suffix>".
+    Skipped entirely (including joining argv) when INFO is filtered out.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("============================================================")
+    if description:
+        logger.info("▶ %s", description)
+    logger.info("$ %s %s", shlex.join(argv), suffix)
+    logger.info("============================================================")
+
+
+def _clip(text: str) -> str:
+    """Keep at most MAX_LOG_CHUNK characters (the end, where errors usually are)."""
+    if len(text) <= MAX_LOG_CHUNK:
+        return text
+    return "…" + text[-MAX_LOG_CHUNK:]
+
+
+def _log_output(logger_fn, tag: str, lines: Iterable[str]) -> None:
+    """
+    Emit the tail of a command's output as a single, size-bounded record.
+    """
+    tail = list(lines)[-OUTPUT_TAIL_LINES:]
+    if not tail:
+        return
+    logger_fn("%s (last %d lines):\n%s", tag, len(tail), _clip("\n".join(tail)))
+
+
+def _stream_output(
+    proc: subprocess.Popen,
+    logger,
+) -> Deque[Tuple[str, bytes]]:
+    """
+    Forward a running process's stdout/stderr to the logger line by line,
+    as the lines arrive, until both pipes reach EOF.
+
+    Reads raw chunks from whichever pipe is ready (so a chatty stderr can
+    never block on a half-written stdout line) and only holds the current
+    partial line per stream in memory, plus the last OUTPUT_TAIL_LINES
+    lines, which are returned for error reporting.
+    """
+    pending = {"STDOUT": b"", "STDERR": b""}
+    tail: Deque[Tuple[str, bytes]] = deque(maxlen=OUTPUT_TAIL_LINES)
+    # Only decode and log per line when INFO output will actually be emitted.
+    log_lines = logger.isEnabledFor(logging.INFO)
+
+    with selectors.DefaultSelector() as sel:
+        sel.register(proc.stdout, selectors.EVENT_READ, "STDOUT")
+        sel.register(proc.stderr, selectors.EVENT_READ, "STDERR")
+
+        while sel.get_map():
+            for key, _ in sel.select():
+                tag = key.data
+                chunk = os.read(key.fd, 64 * 1024)
+
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    lines = [pending[tag]] if pending[tag] else []
+                    pending[tag] = b""
+                else:
+                    *lines, pending[tag] = (pending[tag] + chunk).split(b"\n")
+
+                for line in lines:
+                    tail.append((tag, line))
+                    if log_lines:
+                        logger.info(
+                            "%s | %s",
+                            tag,
+                            _clip(line.decode("utf-8", errors="replace").rstrip()),
+                        )
+
+    return tail
+
+
 def _run_command(
     command: list[str],
     cwd: Optional[Path] = None,
@@ -83,45 +223,271 @@ def _run_command(
 
     - Uses the project root (or provided cwd) as working directory.
     - Injects CLIMATE_DATA_ROOT / CLIMATE_LOG_ROOT / DUCKDB_PATH / DBT_PROFILES_DIR.
-    - Captures stdout/stderr and logs them through Prefect's logger.
+    - Streams stdout/stderr line by line through Prefect's logger while the
+      command runs, instead of buffering the whole output in memory.
     - Raises on non-zero exit so Prefect can mark the task as failed.
     """
     logger = get_run_logger()
     cwd_path = cwd if cwd is not None else PROJECT_ROOT
     cwd_str = str(cwd_path)
 
-    logger.info("============================================================")
-    if description:
-        logger.info("▶ %s", description)
-    logger.info("$ %s (cwd=%s)", " ".join(command), cwd_str)
-    logger.info("============================================================")
+    _log_command_header(logger, description, command, f"(cwd={cwd_str})")
 
     env = build_subprocess_env(extra_env)
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd=cwd_str,
-            env=env,
-            check=True,
+    with subprocess.Popen(
+        command,
+        cwd=cwd_str,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        tail = _stream_output(proc, logger)
+        returncode = proc.wait()
+
+    if returncode != 0:
+        logger.error("❌ Command failed with return code %s", returncode)
+        logger.error("Failed command: %s", shlex.join(command))
+        _log_output(
+            logger.error,
+            "Output",
+            (f"{tag} | {line.decode('utf-8', errors='replace').rstrip()}" for tag, line in tail),
+        )
+        raise subprocess.CalledProcessError(returncode, command)
+
+    logger.info("✅ Command succeeded with return code %s", returncode)
+
+
+# ==========================
+# Long-lived worker
+# ==========================
+
+class WorkerClient:
+    """
+    Client for climate_pipeline.orchestration.worker.
+
+    Starts the worker lazily on first use and sends it one JSON command per
+    task, so interpreter startup and heavy imports (pandas, scikit-learn,
+    duckdb) are paid once per flow run rather than once per task. Worker
+    stderr is forwarded line by line to the logger of the task that is
+    currently calling. If the worker dies it is restarted on the next call.
+    """
+
+    # Keep in sync with worker.OUTPUT_DONE_MARKER (not imported, so the flow
+    # process doesn't pull in the worker's heavy imports).
+    OUTPUT_DONE_MARKER = "\x00climate-worker-output-done"
+
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._logger = None
+        self._output_done = threading.Event()
+        self._tail: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            WORKER,
+            cwd=str(PROJECT_ROOT),
+            env=build_subprocess_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        threading.Thread(
+            target=self._forward_stderr,
+            args=(self._proc,),
+            name="climate-worker-stderr",
+            daemon=True,
+        ).start()
+
+    def _forward_stderr(self, proc: subprocess.Popen) -> None:
+        for line in proc.stderr:
+            line = line.rstrip()
+            if line == self.OUTPUT_DONE_MARKER:
+                self._output_done.set()
+                continue
+            self._tail.append(line)
+            logger = self._logger
+            if logger is not None:
+                logger.info("WORKER | %s", _clip(line))
+        # EOF: the worker is gone, nothing more to wait for.
+        self._output_done.set()
+
+    def call(self, op: str, args: list[str], description: str = "") -> None:
+        """
+        Run one worker operation; raise CalledProcessError on non-zero exit.
+        """
+        with self._lock:
+            logger = get_run_logger()
+            self._logger = logger
+
+            _log_command_header(logger, description, [op, *args], "(worker)")
+
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+
+            self._output_done.clear()
+            self._tail.clear()
+            self._proc.stdin.write(json.dumps({"op": op, "args": args}) + "\n")
+            self._proc.stdin.flush()
+            reply = self._proc.stdout.readline()
+
+            # Let the stderr forwarder catch up so this call's output is
+            # logged under this task, not the next one.
+            self._output_done.wait(timeout=10)
+
+            if not reply:
+                returncode = self._proc.wait()
+                self._proc = None
+                logger.error("❌ Worker exited unexpectedly with return code %s", returncode)
+                _log_output(logger.error, "Worker output", self._tail)
+                raise subprocess.CalledProcessError(returncode, [op, *args])
+
+            returncode = int(json.loads(reply)["returncode"])
+            if returncode != 0:
+                logger.error("❌ Command failed with return code %s", returncode)
+                logger.error("Failed command: %s", shlex.join([op, *args]))
+                _log_output(logger.error, "Worker output", self._tail)
+                raise subprocess.CalledProcessError(returncode, [op, *args])
+
+            logger.info("✅ Command succeeded with return code %s", returncode)
+
+    def close(self) -> None:
+        """
+        Ask the worker to exit (EOF on stdin) and wait for it.
+        """
+        with self._lock:
+            proc, self._proc = self._proc, None
+            if proc is None:
+                return
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+
+_WORKER = WorkerClient()
+
+
+def _run_entrypoint(op: str, args: list[str], description: str = "") -> None:
+    """
+    Run a project entrypoint in the shared worker, or as its own subprocess
+    when CLIMATE_PIPELINE_WORKER=0.
+    """
+    if USE_WORKER:
+        _WORKER.call(op, args, description=description)
+    else:
+        _run_command(
+            [*ENTRYPOINTS[op], *args],
+            cwd=PROJECT_ROOT,
+            description=description,
+        )
+
+
+# ==========================
+# dbt (in-process)
+# ==========================
+
+# One runner for the whole process. dbtRunner does not support concurrent
+# invocations, which is fine here: dbt tasks are chained, never parallel.
+_DBT_RUNNER = dbtRunner()
+
+
+# The keys _get_base_env forces or defaults. dbt only needs these set; the
+# rest of os.environ is already what the base env was copied from.
+_DBT_ENV_KEYS = (
+    "CLIMATE_ENV",
+    "CLIMATE_DATA_ROOT",
+    "CLIMATE_LOG_ROOT",
+    "DUCKDB_PATH",
+    "DBT_PROFILES_DIR",
+    "OPEN_METEO_GEOCODING_BASE_URL",
+    "OPEN_METEO_HISTORICAL_BASE_URL",
+)
+
+
+@contextmanager
+def _scoped_environ(overrides: Dict[str, str]) -> Iterator[None]:
+    """
+    Temporarily set the given keys in os.environ, restoring (or removing)
+    only those keys afterwards. The rest of the environment is left alone,
+    so other threads never see it half-filled and their changes survive.
+    """
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+# Node statuses dbt reports for failed models, seeds, snapshots and tests.
+_DBT_FAILED_STATUSES = frozenset({"error", "fail", "runtime error"})
+
+
+def _log_dbt_failures(logger, result: dbtRunnerResult) -> list[str]:
+    """
+    Log every failed dbt node with its message and return their ids.
+
+    In-process dbt prints to this process's stdout, not the Prefect run
+    logger, and a failing model or test leaves result.exception unset, so
+    this is where the failure reasons reach the run logs.
+    """
+    failed: list[str] = []
+    for node_result in getattr(result.result, "results", None) or []:
+        status = str(getattr(node_result.status, "value", node_result.status))
+        if status not in _DBT_FAILED_STATUSES:
+            continue
+        node_id = node_result.node.unique_id
+        failed.append(node_id)
+        logger.error(
+            "dbt %s %s: %s",
+            node_id,
+            status,
+            _clip(node_result.message or "(no message)"),
         )
-        if result.stdout:
-            logger.info("STDOUT:\n%s", result.stdout.rstrip())
-        if result.stderr:
-            logger.info("STDERR:\n%s", result.stderr.rstrip())
+    return failed
 
-        logger.info("✅ Command succeeded with return code %s", result.returncode)
-    except subprocess.CalledProcessError as exc:
-        if exc.stdout:
-            logger.error("STDOUT (on error):\n%s", exc.stdout.rstrip())
-        if exc.stderr:
-            logger.error("STDERR (on error):\n%s", exc.stderr.rstrip())
 
-        logger.error("❌ Command failed with return code %s", exc.returncode)
-        logger.error("Failed command: %s", " ".join(command))
-        raise
+def run_dbt_in_process(
+    args: list[str],
+    description: str = "",
+) -> dbtRunnerResult:
+    """
+    Run a dbt command inside this Python process via dbtRunner.
+
+    Avoids a fresh interpreter + dbt-core / adapter import per invocation.
+    The project keys of the subprocess environment (build_subprocess_env)
+    are set while dbt runs, so profiles.yml resolves DUCKDB_PATH and
+    CLIMATE_DATA_ROOT identically. Raises if dbt reports failure.
+    """
+    logger = get_run_logger()
+    dbt_args = [*args, "--project-dir", str(DBT_DIR), "--profiles-dir", str(DBT_DIR)]
+
+    _log_command_header(logger, description, ["dbt", *dbt_args], "(in-process)")
+
+    env = build_subprocess_env()
+    with _scoped_environ({key: env[key] for key in _DBT_ENV_KEYS}):
+        result = _DBT_RUNNER.invoke(dbt_args)
+
+    if not result.success:
+        failed = _log_dbt_failures(logger, result)
+        logger.error("❌ dbt %s failed", shlex.join(args))
+        detail = f" ({', '.join(failed)})" if failed else ""
+        raise RuntimeError(f"dbt {' '.join(args)} failed{detail}") from result.exception
+
+    logger.info("✅ dbt %s succeeded", shlex.join(args))
+    return result
 
 
 # ==========================
@@ -140,23 +506,42 @@ def ingest_recent() -> None:
       - Emits a JSON summary to stdout and exits non-zero only if
         all requests fail or no successful requests are made.
     """
-    _run_command(
-        ["uv", "run", "fetch-daily-weather", "--mode", "recent"],
-        cwd=PROJECT_ROOT,
+    _run_entrypoint(
+        "fetch-daily-weather",
+        ["--mode", "recent"],
         description="Ingesting recent daily weather data (year-to-date, all cities)",
     )
 
 
-@task(retries=3, retry_delay_seconds=60)
-def ingest_backfill(start_date: Optional[str] = None, end_date: Optional[str] = None) -> None:
+@task
+def list_backfill_cities() -> list[int]:
+    """
+    city_id values to backfill, read from the dim_city seed (the same file
+    fetch-daily-weather loads).
     """
-    Historical ingestion:
-    Uses fetch-daily-weather --mode backfill.
+    return [city.city_id for city in load_cities_from_dim_city(str(DIM_CITY_PATH))]
+
+
+@task(retries=3, retry_delay_seconds=60, tags=[OPEN_METEO_TAG])
+def ingest_backfill_city(
+    city_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> None:
+    """
+    Historical ingestion for a single city:
+    Uses fetch-daily-weather --mode backfill --city-id <city_id>.
 
     If start_date/end_date are provided (YYYY-MM-DD), they override the
     settings.yaml time_window; otherwise settings.yaml defines the range.
+
+    Each city runs as its own subprocess (the shared worker handles one
+    command at a time), so the backfill flow can fetch several cities
+    concurrently. Concurrency is bounded by the flow's task runner and can
+    additionally be capped server-side with a Prefect concurrency limit on
+    the OPEN_METEO_TAG tag.
     """
-    cmd = ["uv", "run", "fetch-daily-weather", "--mode", "backfill"]
+    cmd = [*FETCH_DAILY_WEATHER, "--mode", "backfill", "--city-id", str(city_id)]
 
     if start_date is not None:
         cmd.extend(["--start-date", start_date])
@@ -166,7 +551,7 @@ def ingest_backfill(start_date: Optional[str] = None, end_date: Optional[str] =
     _run_command(
         cmd,
         cwd=PROJECT_ROOT,
-        description="Ingesting historical daily weather data (backfill, all cities)",
+        description=f"Ingesting historical daily weather data (backfill, city_id={city_id})",
     )
 
 
@@ -181,22 +566,23 @@ def run_dbt_build() -> None:
       landing → clean → anomaly → ml.
     Uses the dbt project in the ./dbt directory.
     """
-    _run_command(
-        ["uv", "run", "dbt", "build", "--project-dir", ".", "--profiles-dir", "."],
-        cwd=DBT_DIR,
+    run_dbt_in_process(
+        ["build"],
         description="Running dbt build (landing/clean/anomaly/ml layer models)",
     )
 
 
 @task(retries=2, retry_delay_seconds=60)
-def run_dbt_tests() -> None:
+def run_dbt_build_only() -> None:
     """
-    Run dbt test against the current warehouse state.
+    Build seeds and models without running dbt tests.
+
+    Used when with_dbt_tests=False. Plain `dbt run` would skip the dim_city
+    seed, so this is `dbt build` with test resources excluded.
     """
-    _run_command(
-        ["uv", "run", "dbt", "test", "--project-dir", ".", "--profiles-dir", "."],
-        cwd=DBT_DIR,
-        description="Running dbt tests (data quality checks)",
+    run_dbt_in_process(
+        ["build", "--exclude-resource-type", "test", "--exclude-resource-type", "unit_test"],
+        description="Running dbt build without tests (landing/clean/anomaly/ml layer models)",
     )
 
 
@@ -215,9 +601,9 @@ def run_ml_training() -> None:
       - Writes model + metrics artifacts under ./models.
       - Logs ML metrics into DuckDB (pipeline_ml_metrics) for observability.
     """
-    _run_command(
-        ["uv", "run", "climate-train-baseline"],
-        cwd=PROJECT_ROOT,
+    _run_entrypoint(
+        "climate-train-baseline",
+        [],
         description="Training baseline anomaly model",
     )
 
@@ -226,19 +612,22 @@ def run_ml_training() -> None:
 def run_pytests() -> None:
     """
     Run the project test suite (pytest).
+
+    Uses pytest.main() in the worker, which already has the project modules
+    imported, unless CLIMATE_PYTEST_SUBPROCESS=1 asks for a fresh process.
     """
-    _run_command(
-        ["uv", "run", "pytest"],
-        cwd=PROJECT_ROOT,
-        description="Running project tests (pytest)",
-    )
+    description = "Running project tests (pytest)"
+    if PYTEST_SUBPROCESS:
+        _run_command([*PYTEST, *PYTEST_ARGS], cwd=PROJECT_ROOT, description=description)
+    else:
+        _run_entrypoint("pytest", PYTEST_ARGS, description=description)
 
 
 # ==========================
 # Task: run logging to DuckDB
 # ==========================
 
-@task
+@task(persist_result=False)
 def log_run_to_duckdb(
     flow_name: str,
     run_mode: str,
@@ -291,7 +680,43 @@ def log_run_to_duckdb(
 # Flows
 # ==========================
 
-@flow(name="daily-climate-pipeline")
+def _submit_warehouse_steps(
+    ingested: list,
+    with_dbt_tests: bool,
+    with_tests: bool,
+) -> PrefectFuture:
+    """
+    Submit the dbt / ML / pytest steps that follow ingestion and return the
+    terminal future. `ingested` is the wait_for list for the first step:
+    ingestion futures, or allow_failure() wrappers around them.
+
+    Dependencies are expressed with wait_for so the task runner can schedule
+    each step as soon as its inputs are ready. Every step below opens the
+    DuckDB warehouse, and DuckDB allows a single writer process per file, so
+    they stay chained one after another rather than fanning out.
+    """
+    logger = get_run_logger()
+
+    # 2-3) Transformations via dbt. `dbt build` runs each model's tests
+    #      inline, so dbt tests never need a separate `dbt test` pass.
+    if with_dbt_tests:
+        logger.info("🧪 Running dbt tests inline with dbt build (with_dbt_tests=True)")
+        upstream = run_dbt_build.submit(wait_for=ingested)
+    else:
+        upstream = run_dbt_build_only.submit(wait_for=ingested)
+
+    # 4) ML training
+    upstream = run_ml_training.submit(wait_for=[upstream])
+
+    # 5) Optional pytest
+    if with_tests:
+        logger.info("🧪 Running pytest because with_tests=True")
+        upstream = run_pytests.submit(wait_for=[upstream])
+
+    return upstream
+
+
+@flow(name="daily-climate-pipeline", task_runner=ThreadPoolTaskRunner())
 def daily_climate_flow(
     with_dbt_tests: bool = False,
     with_tests: bool = False,
@@ -302,7 +727,7 @@ def daily_climate_flow(
     Steps:
       1. Incremental ingestion (recent mode)
       2. dbt build (landing + clean + anomaly + ml layers)
-      3. Optional dbt tests
+      3. Optional dbt tests (run inline by dbt build; skipped otherwise)
       4. ML training (logs ML metrics to DuckDB)
       5. Optional pytest
       6. Log run metadata to DuckDB
@@ -310,28 +735,22 @@ def daily_climate_flow(
     logger = get_run_logger()
     logger.info("🌍 Starting Prefect daily_climate_flow")
 
+    _get_base_env.cache_clear()
     started_at = datetime.now(timezone.utc)
+    t0 = time.monotonic_ns()
 
     # 1) Ingestion (recent)
-    ingest_recent()
+    ingested = [ingest_recent.submit()]
 
-    # 2) Transformations via dbt
-    run_dbt_build()
-
-    # 3) Optional dbt tests
-    if with_dbt_tests:
-        logger.info("🧪 Running dbt tests because with_dbt_tests=True")
-        run_dbt_tests()
-
-    # 4) ML training
-    run_ml_training()
-
-    # 5) Optional pytest
-    if with_tests:
-        logger.info("🧪 Running pytest because with_tests=True")
-        run_pytests()
+    # 2-5) dbt, ML training and optional tests; .result() re-raises failures
+    try:
+        _submit_warehouse_steps(ingested, with_dbt_tests, with_tests).result()
+    finally:
+        _WORKER.close()
 
-    finished_at = datetime.now(timezone.utc)
+    # Derive the end from a monotonic clock so wall-clock jumps (NTP, DST)
+    # during a long run can't skew the recorded duration.
+    finished_at = started_at + timedelta(microseconds=(time.monotonic_ns() - t0) // 1000)
 
     # 6) Log run metadata into DuckDB (best effort)
     log_run_to_duckdb(
@@ -344,7 +763,10 @@ def daily_climate_flow(
     logger.info("✅ daily_climate_flow completed successfully")
 
 
-@flow(name="backfill-climate-pipeline")
+@flow(
+    name="backfill-climate-pipeline",
+    task_runner=ThreadPoolTaskRunner(max_workers=OPEN_METEO_MAX_CONCURRENCY),
+)
 def backfill_climate_flow(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -360,9 +782,10 @@ def backfill_climate_flow(
         otherwise the time_window in settings.yaml is used.
 
     Steps:
-      1. Backfill ingestion
+      1. Backfill ingestion (one task per city, run concurrently;
+         fails the run only if every city fails)
       2. dbt build (landing + clean + anomaly + ml layers)
-      3. Optional dbt tests
+      3. Optional dbt tests (run inline by dbt build; skipped otherwise)
       4. ML training
       5. Optional pytest
       6. Log run metadata to DuckDB
@@ -374,28 +797,49 @@ def backfill_climate_flow(
         end_date,
     )
 
+    _get_base_env.cache_clear()
     started_at = datetime.now(timezone.utc)
+    t0 = time.monotonic_ns()
+
+    # 1) Ingestion (backfill), fanned out per city
+    city_ids = list_backfill_cities()
+    ingested = ingest_backfill_city.map(
+        city_ids,
+        start_date=unmapped(start_date),
+        end_date=unmapped(end_date),
+    )
 
-    # 1) Ingestion (backfill)
-    ingest_backfill(start_date=start_date, end_date=end_date)
-
-    # 2) Transformations via dbt
-    run_dbt_build()
-
-    # 3) Optional dbt tests
-    if with_dbt_tests:
-        logger.info("🧪 Running dbt tests because with_dbt_tests=True")
-        run_dbt_tests()
-
-    # 4) ML training
-    run_ml_training()
-
-    # 5) Optional pytest
-    if with_tests:
-        logger.info("🧪 Running pytest because with_tests=True")
-        run_pytests()
-
-    finished_at = datetime.now(timezone.utc)
+    try:
+        # A city whose requests all fail exits non-zero. As with a single
+        # all-city backfill command, the run only fails when every city
+        # failed; otherwise the warehouse is built from what was fetched.
+        # Crashed or cancelled cities count as failed, not only Failed ones.
+        ingested.wait()
+        failed = [
+            city_id
+            for city_id, future in zip(city_ids, ingested)
+            if not future.state.is_completed()
+        ]
+        if failed and len(failed) == len(city_ids):
+            raise RuntimeError("Backfill ingestion failed for every city")
+        if failed:
+            logger.warning(
+                "⚠️ Backfill ingestion failed for %d of %d cities (city_id=%s); continuing",
+                len(failed),
+                len(city_ids),
+                failed,
+            )
+
+        # 2-5) dbt, ML training and optional tests; .result() re-raises failures
+        _submit_warehouse_steps(
+            [allow_failure(future) for future in ingested],
+            with_dbt_tests,
+            with_tests,
+        ).result()
+    finally:
+        _WORKER.close()
+
+    finished_at = started_at + timedelta(microseconds=(time.monotonic_ns() - t0) // 1000)
 
     # 6) Log run metadata into DuckDB (best effort)
     log_run_to_duckdb(
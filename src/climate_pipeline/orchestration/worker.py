@@ -0,0 +1,144 @@
+"""
+Long-lived worker process for the Prefect flows.
+
+Instead of spawning a fresh interpreter per task (and re-importing pandas,
+scikit-learn, duckdb, ... every time), the flow starts this worker once and
+sends it commands over stdin, one JSON object per line:
+
+    {"op": "fetch-daily-weather", "args": ["--mode", "recent"]}
+
+Each command gets exactly one JSON reply line on stdout:
+
+    {"op": "fetch-daily-weather", "returncode": 0}
+
+Everything the entrypoints print or log goes to stderr, so stdout carries
+replies only.
+
+Usage (normally started by prefect_flow.WorkerClient):
+
+  uv run climate-worker
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import traceback
+from typing import Callable, Dict, List
+
+from climate_pipeline.ingestion.fetch_daily_weather import main as fetch_daily_weather_main
+from climate_pipeline.ml.train import main as train_main
+
+
+# Written to stderr after each operation, right before the reply, so the
+# client knows it has seen all of that operation's output.
+OUTPUT_DONE_MARKER = "\x00climate-worker-output-done"
+
+
+# ==========================
+# Operations
+# ==========================
+
+def _call_main(prog: str, main: Callable[[], None], args: List[str]) -> int:
+    """
+    Run a console-script style main() with the given argv and translate
+    SystemExit into a return code, as if it had run as its own process.
+    """
+    old_argv = sys.argv
+    sys.argv = [prog, *args]
+    try:
+        main()
+        return 0
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        if isinstance(exc.code, int):
+            return exc.code
+        print(exc.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = old_argv
+
+
+def _run_pytest(args: List[str]) -> int:
+    # pytest is a dev dependency, so only import it when asked to run tests.
+    import pytest
+
+    return int(pytest.main(args))
+
+
+OPS: Dict[str, Callable[[List[str]], int]] = {
+    "fetch-daily-weather": lambda args: _call_main(
+        "fetch-daily-weather", fetch_daily_weather_main, args
+    ),
+    "climate-train-baseline": lambda args: _call_main(
+        "climate-train-baseline", train_main, args
+    ),
+    "pytest": _run_pytest,
+}
+
+
+def dispatch(op: str, args: List[str]) -> int:
+    """
+    Run one operation and return its exit code.
+
+    Logging handlers added by the operation (e.g. fetch-daily-weather's
+    setup_logging) are removed afterwards so repeated commands in the same
+    worker don't emit duplicate log lines.
+    """
+    if op not in OPS:
+        print(f"Unknown worker op: {op}", file=sys.stderr)
+        return 2
+
+    root = logging.getLogger()
+    handlers_before = list(root.handlers)
+    try:
+        return OPS[op](args)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        for handler in root.handlers[:]:
+            if handler not in handlers_before:
+                root.removeHandler(handler)
+                handler.close()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+# ==========================
+# Main loop
+# ==========================
+
+def main() -> None:
+    # Keep a private handle on the real stdout for replies, then point fd 1
+    # at stderr so anything the operations print can't corrupt the protocol.
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1, encoding="utf-8")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout.reconfigure(line_buffering=True)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            cmd = json.loads(line)
+            op = str(cmd["op"])
+            args = [str(a) for a in cmd.get("args", [])]
+        except (ValueError, KeyError, TypeError) as exc:
+            print(f"Invalid worker command {line!r}: {exc}", file=sys.stderr)
+            print(OUTPUT_DONE_MARKER, file=sys.stderr, flush=True)
+            replies.write(json.dumps({"op": None, "returncode": 2}) + "\n")
+            continue
+
+        returncode = dispatch(op, args)
+        print(OUTPUT_DONE_MARKER, file=sys.stderr, flush=True)
+        replies.write(json.dumps({"op": op, "returncode": returncode}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -9,17 +10,32 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 
+@lru_cache(maxsize=32)
 def _resolve_under_project(path_str: str) -> Path:
     """
     Resolve a path that may be absolute or relative.
 
-    - If absolute, return as-is.
+    - If absolute, use as-is.
     - If relative, treat it as relative to PROJECT_ROOT.
+
+    The result is lexically normalized ("./data/", "logs/../data" → "data"),
+    so every caller and subprocess sees the same path string for the same
+    location. Symlinks are deliberately not resolved.
+
+    Memoized on the raw string, so the getters below only pay an env lookup
+    per call while still honouring env changes (e.g. monkeypatch in tests).
     """
-    p = Path(path_str)
-    if p.is_absolute():
-        return p
-    return PROJECT_ROOT / p
+    # Cheap string checks first; Path() parsing only when they don't decide.
+    if os.sep == "/":
+        if path_str.startswith("/"):
+            joined = path_str
+        else:
+            joined = os.path.join(PROJECT_ROOT, path_str)
+    else:
+        p = Path(path_str)
+        joined = p if p.is_absolute() else PROJECT_ROOT / p
+
+    return Path(os.path.normpath(joined))
 
 
 def get_data_root() -> Path:
@@ -58,5 +74,4 @@ def get_duckdb_path() -> Path:
     if env_value:
         return _resolve_under_project(env_value)
 
-    data_root = get_data_root()
-    return data_root / "warehouse" / "climate.duckdb"
\ No newline at end of file
+    return get_data_root() / "warehouse" / "climate.duckdb"
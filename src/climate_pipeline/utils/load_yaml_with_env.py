@@ -1,12 +1,59 @@
+import copy
 import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
 import yaml
-from typing import Any, Dict
 
-def load_yaml_with_env(path: str) -> Dict[str, Any]:
-    """Load a YAML file and expand ${VAR} / ${VAR:-default} using environment variables."""
-    with open(path, "r", encoding="utf-8") as f:
+try:
+    # libyaml C bindings, when PyYAML was built with them
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover - pure-Python fallback
+    from yaml import SafeLoader as _Loader
+
+# ${VAR} or ${VAR:-default}
+_VAR_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+
+# path -> (st_mtime_ns, raw text); re-read only when the file changes
+_RAW_CACHE: Dict[str, Tuple[int, str]] = {}
+
+
+def _read_raw(path: str) -> str:
+    key = os.path.abspath(path)
+    mtime_ns = os.stat(key).st_mtime_ns
+    cached = _RAW_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(key, "r", encoding="utf-8") as f:
         raw = f.read()
+    _RAW_CACHE[key] = (mtime_ns, raw)
+    return raw
+
 
-    # Use shell-style env expansion on the raw text
-    expanded = os.path.expandvars(raw)
-    return yaml.safe_load(expanded)
\ No newline at end of file
+def _expand_var(match: "re.Match[str]") -> str:
+    # Shell semantics: ${VAR:-default} uses the default when VAR is unset or
+    # empty. Like os.path.expandvars, an unset ${VAR} is left as written.
+    name, default = match.group(1), match.group(2)
+    value = os.environ.get(name)
+    if default is not None:
+        return value or default
+    return match.group(0) if value is None else value
+
+
+def _expand_env(raw: str) -> str:
+    return _VAR_RE.sub(_expand_var, raw)
+
+
+@lru_cache(maxsize=32)
+def _parse(expanded: str) -> Any:
+    return yaml.load(expanded, Loader=_Loader)
+
+
+def load_yaml_with_env(path: str) -> Dict[str, Any]:
+    """Load a YAML file and expand ${VAR} / ${VAR:-default} using environment variables."""
+    # Parsing is cached on the expanded text, so a changed environment still
+    # yields a fresh result; callers get their own copy to mutate.
+    expanded = _expand_env(_read_raw(path))
+    return copy.deepcopy(_parse(expanded))
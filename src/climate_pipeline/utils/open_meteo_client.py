@@ -5,6 +5,8 @@ import requests
 
 import time
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,31 @@ class OpenMeteoClient:
         self.geocoding_base_url = geocoding_base_url
         self.historical_base_url = historical_base_url
 
+        # One pooled session per client: consecutive requests to the same
+        # Open-Meteo host reuse the keep-alive connection instead of paying a
+        # new TCP + TLS handshake each time. Retries stay in our own code
+        # (429 backoff below, fetch_daily_with_retries upstream), so urllib3
+        # is told not to retry on its own.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=Retry(total=0),
+            pool_connections=4,
+            pool_maxsize=10,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers["Accept-Encoding"] = "gzip"
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "OpenMeteoClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def geocode_city(
         self,
         name: str,
@@ -31,7 +58,7 @@ class OpenMeteoClient:
             params["country_code"] = country_code
 
         logger.info("Geocoding city: %s (%s)", name, country_code or "no country filter")
-        resp = requests.get(self.geocoding_base_url, params=params, timeout=timeout)
+        resp = self._session.get(self.geocoding_base_url, params=params, timeout=timeout)
         resp.raise_for_status()
         data = resp.json()
 
@@ -90,7 +117,7 @@ class OpenMeteoClient:
                 attempt,
             )
             try:
-                resp = requests.get(self.historical_base_url, params=params, timeout=timeout)
+                resp = self._session.get(self.historical_base_url, params=params, timeout=timeout)
                 resp.raise_for_status()
                 data = resp.json()
 
@@ -0,0 +1,25 @@
+# tests/_ml_constants.py
+
+"""
+ML column names shared by the tests.
+
+Kept here rather than imported from climate_pipeline.ml.train, which
+would pull scikit-learn into every test collection.
+"""
+
+# Keep these in sync with src/climate_pipeline/ml/train.py
+TARGET_COL = "is_event_next_month"
+
+FEATURE_COLS = [
+    "anomaly_tmean_c",
+    "roll_mean_3",
+    "roll_mean_6",
+    "roll_std_3",
+    "roll_std_6",
+    "delta_1m",
+    "delta_3m",
+    "max_lagged_corr",
+    "lead_lag_months",
+    "sin_month",
+    "cos_month",
+]
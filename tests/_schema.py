@@ -0,0 +1,76 @@
+# tests/_schema.py
+
+"""
+Catalog-based schema helpers for the warehouse tests.
+
+Schema checks read column names and DuckDB type names from
+information_schema.columns instead of fetching a row into pandas and
+inspecting DataFrame dtypes.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import duckdb
+
+
+INTEGER_TYPES = frozenset({
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+})
+FLOAT_TYPES = frozenset({"FLOAT", "DOUBLE"})
+
+
+def read_warehouse_schema(con: duckdb.DuckDBPyConnection) -> Dict[str, Dict[str, str]]:
+    """
+    Map table/view name -> {column name -> DuckDB data type} for everything
+    in main, from a single catalog query.
+    """
+    rows = con.execute(
+        """
+        SELECT table_name, column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'main'
+        ORDER BY table_name, ordinal_position
+        """
+    ).fetchall()
+
+    schema: Dict[str, Dict[str, str]] = {}
+    for table_name, column_name, data_type in rows:
+        schema.setdefault(table_name, {})[column_name] = data_type
+    return schema
+
+
+def has_table(con: duckdb.DuckDBPyConnection, name: str) -> bool:
+    """
+    Live catalog probe for a table or view in main. Use this instead of the
+    session table_names set when the relation may be created mid-session.
+    """
+    row = con.execute(
+        """
+        SELECT 1
+        FROM information_schema.tables
+        WHERE table_schema = 'main' AND table_name = ?
+        LIMIT 1
+        """,
+        [name],
+    ).fetchone()
+    return row is not None
+
+
+def is_integer_type(data_type: str) -> bool:
+    return data_type in INTEGER_TYPES
+
+
+def is_numeric_type(data_type: str) -> bool:
+    return (
+        data_type in INTEGER_TYPES
+        or data_type in FLOAT_TYPES
+        or data_type.startswith("DECIMAL")
+    )
+
+
+def is_date_like_type(data_type: str) -> bool:
+    """DATE or any TIMESTAMP variant."""
+    return data_type == "DATE" or data_type.startswith("TIMESTAMP")
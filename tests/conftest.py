@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import os
+import sys
 from pathlib import Path
-from typing import Iterator
+from typing import Dict, Iterator, Optional
 
 import duckdb
 import pytest
 
+from tests._schema import has_table, read_warehouse_schema
+
 
 # ======================================================
 # Core paths
@@ -32,33 +35,81 @@ def duckdb_path(project_root: Path) -> Path:
 # Environment wiring
 # ======================================================
 
-@pytest.fixture(autouse=True)
-def configure_test_env(monkeypatch: pytest.MonkeyPatch, project_root: Path, duckdb_path: Path) -> None:
+@pytest.fixture(scope="session", autouse=True)
+def configure_test_env(project_root: Path, duckdb_path: Path) -> Iterator[None]:
     """
     Automatically configure environment variables for all tests so that
     code relying on CLIMATE_DATA_ROOT / CLIMATE_LOG_ROOT / DUCKDB_PATH
     behaves consistently.
-    """
-    data_root = project_root / "data"
-    log_root = project_root / "logs"
-    dbt_dir = project_root / "dbt"
 
-    monkeypatch.setenv("CLIMATE_ENV", "test")
-    monkeypatch.setenv("CLIMATE_DATA_ROOT", str(data_root))
-    monkeypatch.setenv("CLIMATE_LOG_ROOT", str(log_root))
-    monkeypatch.setenv("DUCKDB_PATH", str(duckdb_path))
-    monkeypatch.setenv("DBT_PROFILES_DIR", str(dbt_dir))
+    The values are the same for every test, so they are set once per
+    session and the previous environment is restored at the end. Tests that
+    need different values can still override them with monkeypatch.
+    """
+    test_env = {
+        "CLIMATE_ENV": "test",
+        "CLIMATE_DATA_ROOT": str(project_root / "data"),
+        "CLIMATE_LOG_ROOT": str(project_root / "logs"),
+        "DUCKDB_PATH": str(duckdb_path),
+        "DBT_PROFILES_DIR": str(project_root / "dbt"),
+    }
+    saved = {key: os.environ.get(key) for key in test_env}
+
+    os.environ.update(test_env)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
 
 
 # ======================================================
 # DuckDB connection fixture (used by many tests)
 # ======================================================
 
+class _SharedWarehouse:
+    """
+    One read-only DuckDB connection shared by every test in the session,
+    opened on first use.
+
+    DuckDB refuses to open the same file read-write in this process while a
+    read-only connection is open, so fixtures that write (see
+    trained_warehouse) release it first; the next reader reopens it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: duckdb.DuckDBPyConnection | None = None
+
+    def get(self) -> duckdb.DuckDBPyConnection:
+        if self._conn is None:
+            self._conn = duckdb.connect(str(self.path), read_only=True)
+        return self._conn
+
+    def release(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@pytest.fixture(scope="session")
+def shared_warehouse(duckdb_path: Path) -> Iterator[_SharedWarehouse]:
+    warehouse = _SharedWarehouse(duckdb_path)
+    try:
+        yield warehouse
+    finally:
+        warehouse.release()
+
+
 @pytest.fixture
-def con(duckdb_path: Path) -> Iterator[duckdb.DuckDBPyConnection]:
+def con(duckdb_path: Path, shared_warehouse: _SharedWarehouse) -> duckdb.DuckDBPyConnection:
     """
     Provide a read-only DuckDB connection for tests that need to query
-    the warehouse directly.
+    the warehouse directly. The connection is shared across the session,
+    so tests must not close it.
 
     Any test that requires this fixture will be skipped if the DuckDB
     file does not exist yet (e.g., before the pipeline / dbt has run).
@@ -66,11 +117,86 @@ def con(duckdb_path: Path) -> Iterator[duckdb.DuckDBPyConnection]:
     if not duckdb_path.exists():
         pytest.skip(f"DuckDB file not found at {duckdb_path} – run the pipeline/dbt first.")
 
-    conn = duckdb.connect(str(duckdb_path), read_only=True)
+    return shared_warehouse.get()
+
+
+@pytest.fixture(scope="session")
+def warehouse_schema(
+    duckdb_path: Path, shared_warehouse: _SharedWarehouse
+) -> Dict[str, Dict[str, str]]:
+    """
+    {table/view name: {column name: DuckDB type}} for the warehouse's main
+    schema, read with one catalog query per session. Schema tests look up
+    the relation they need, e.g. warehouse_schema.get("ml_features", {}).
+
+    Only reflects objects that existed when first requested; tests that
+    create tables themselves must query the catalog directly (has_table).
+    """
+    if not duckdb_path.exists():
+        pytest.skip(f"DuckDB file not found at {duckdb_path} – run the pipeline/dbt first.")
+
+    return read_warehouse_schema(shared_warehouse.get())
+
+
+@pytest.fixture(scope="session")
+def table_names(warehouse_schema: Dict[str, Dict[str, str]]) -> frozenset[str]:
+    """
+    Names of all tables and views in the warehouse's main schema, so
+    existence checks are plain set lookups.
+    """
+    return frozenset(warehouse_schema)
+
+
+# ======================================================
+# Trained baseline model (training runs once per session)
+# ======================================================
+
+@pytest.fixture(scope="session")
+def trained_warehouse(
+    duckdb_path: Path,
+    shared_warehouse: _SharedWarehouse,
+    table_names: frozenset[str],
+) -> Optional[int]:
+    """
+    Run the climate-train-baseline entrypoint once per session against the
+    test warehouse and return the number of rows in pipeline_ml_metrics
+    afterwards (None if training did not create the table).
+
+    Skipped when ml_features does not exist (dbt has not run yet).
+    """
+    if "ml_features" not in table_names:
+        pytest.skip(
+            "Table 'ml_features' does not exist. "
+            "Run dbt models before executing this test."
+        )
+
+    # Imported lazily: training pulls in scikit-learn, which most tests
+    # never need.
+    from climate_pipeline.ml.train import main as train_main
+
+    # Training writes to the warehouse, so drop the shared read-only handle.
+    shared_warehouse.release()
+
+    # We call the module's main() directly to avoid spawning a subprocess.
+    old_argv = sys.argv
     try:
-        yield conn
+        sys.argv = [
+            "climate-train-baseline",
+            "--db-path",
+            str(duckdb_path),
+            "--table-name",
+            "ml_features",
+        ]
+        train_main()
     finally:
-        conn.close()
+        sys.argv = old_argv
+
+    con = shared_warehouse.get()
+    if not has_table(con, "pipeline_ml_metrics"):
+        return None
+    return con.execute(
+        'SELECT COUNT(*) FROM "main"."pipeline_ml_metrics"'
+    ).fetchone()[0]
 
 
 # ======================================================
@@ -82,4 +208,4 @@ def warehouse_path(duckdb_path: Path) -> Path:
     """
     Some tests expect a fixture called `warehouse_path`. Reuse duckdb_path.
     """
-    return duckdb_path
\ No newline at end of file
+    return duckdb_path
@@ -1,71 +1,57 @@
 # tests/test_anomaly_layer.py
 
-import pandas as pd
+from tests._schema import is_integer_type
 
+ANOMALY_TABLES = [
+    "anomaly_city_month",
+    "anomaly_city_events",
+    "anomaly_city_lags",
+    "anomaly_city_correlations",
+]
 
-def test_anomaly_tables_exist(con):
-    """
-    Ensure the anomaly-layer tables exist:
-      - anomaly_city_month
-      - anomaly_city_events
-      - anomaly_city_lags
-      - anomaly_city_correlations
-    """
-    tables = con.execute("SHOW TABLES").df()["name"].tolist()
-
-    expected = {
-        "anomaly_city_month",
-        "anomaly_city_events",
-        "anomaly_city_lags",
-        "anomaly_city_correlations",
-    }
-
-    missing = expected - set(tables)
-    assert not missing, f"Missing anomaly tables: {missing}"
+# Table names can't be bound as parameters, so build the statement once.
+# One round-trip; EXISTS stops at the first row of each table.
+ANOMALY_HAS_ROWS_SQL = "SELECT " + ", ".join(
+    f'EXISTS (SELECT 1 FROM "{table}")' for table in ANOMALY_TABLES
+)
 
 
-def test_anomaly_city_month_schema(con):
+def test_anomaly_city_month_schema(warehouse_schema):
     """
     Basic schema checks for anomaly_city_month:
       - must have (city_id, year, month)
       - year and month should be integer-like
     """
-    df = con.execute("SELECT * FROM anomaly_city_month LIMIT 1").df()
-    if df.empty:
-        # Let the "not empty" test handle emptiness;
-        # this test is only about schema.
-        return
+    schema = warehouse_schema.get("anomaly_city_month", {})
 
     required = {"city_id", "year", "month"}
-    missing = required - set(df.columns)
+    missing = required - schema.keys()
     assert not missing, f"Missing required columns in anomaly_city_month: {missing}"
 
-    assert pd.api.types.is_integer_dtype(df["year"]), (
+    assert is_integer_type(schema["year"]), (
         "Expected 'year' column in anomaly_city_month to be integer-like."
     )
-    assert pd.api.types.is_integer_dtype(df["month"]), (
+    assert is_integer_type(schema["month"]), (
         "Expected 'month' column in anomaly_city_month to be integer-like."
     )
 
 
-def test_anomaly_city_events_schema(con):
+def test_anomaly_city_events_schema(warehouse_schema):
     """
     Basic schema checks for anomaly_city_events:
       - must have (city_id, year, month)
       - must have the event flag column is_event_next_month
     """
-    df = con.execute("SELECT * FROM anomaly_city_events LIMIT 1").df()
-    if df.empty:
-        return
+    schema = warehouse_schema.get("anomaly_city_events", {})
 
     required = {"city_id", "year", "month", "is_event_next_month"}
-    missing = required - set(df.columns)
+    missing = required - schema.keys()
     assert not missing, f"Missing required columns in anomaly_city_events: {missing}"
 
-    assert pd.api.types.is_integer_dtype(df["year"]), (
+    assert is_integer_type(schema["year"]), (
         "Expected 'year' column in anomaly_city_events to be integer-like."
     )
-    assert pd.api.types.is_integer_dtype(df["month"]), (
+    assert is_integer_type(schema["month"]), (
         "Expected 'month' column in anomaly_city_events to be integer-like."
     )
 
@@ -74,20 +60,13 @@ def test_anomaly_tables_not_empty(con):
     """
     Sanity check that anomaly tables are non-empty if the pipeline ran.
     """
-    counts = {}
-    for table in [
-        "anomaly_city_month",
-        "anomaly_city_events",
-        "anomaly_city_lags",
-        "anomaly_city_correlations",
-    ]:
-        n = con.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
-        counts[table] = n
+    row = con.execute(ANOMALY_HAS_ROWS_SQL).fetchone()
+    has_rows = dict(zip(ANOMALY_TABLES, row))
 
     # At minimum, month + events should be populated if upstream ran.
-    assert counts["anomaly_city_month"] > 0, (
+    assert has_rows["anomaly_city_month"], (
         "anomaly_city_month is empty — check upstream dbt models."
     )
-    assert counts["anomaly_city_events"] > 0, (
+    assert has_rows["anomaly_city_events"], (
         "anomaly_city_events is empty — check anomaly event generation."
     )
\ No newline at end of file
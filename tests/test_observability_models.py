@@ -1,44 +1,23 @@
 # tests/test_observability_models.py
 
-import pandas as pd
-
-
-def _table_or_view_exists(con, name: str) -> bool:
-    """
-    Helper to check whether a table or view with the given name exists
-    in the main schema.
-    """
-    df = con.execute("SHOW TABLES").df()
-    # DuckDB's SHOW TABLES includes a 'name' column
-    names = df["name"].tolist()
-    return name in names
+from tests._schema import is_date_like_type, is_numeric_type
 
 
 # -------------------------------------------------------------------
 # pipeline_runs view
 # -------------------------------------------------------------------
 
-def test_pipeline_runs_view_exists(con):
-    """
-    Ensure the pipeline_runs view exists (dbt observability).
-    """
-    assert _table_or_view_exists(con, "pipeline_runs"), (
-        "Expected view/table 'pipeline_runs' to exist. "
-        "Run dbt observability models if this fails."
-    )
-
-
-def test_pipeline_runs_basic_columns(con):
+def test_pipeline_runs_basic_columns(warehouse_schema, table_names):
     """
     Check that pipeline_runs exposes the expected core columns.
     """
-    if not _table_or_view_exists(con, "pipeline_runs"):
+    # table_names covers both tables and views in main
+    if "pipeline_runs" not in table_names:
         # Fail loudly; this is a structural error.
         raise AssertionError("pipeline_runs does not exist.")
 
-    df = con.execute('SELECT * FROM "pipeline_runs" LIMIT 1').df()
+    columns = warehouse_schema.get("pipeline_runs", {}).keys()
 
-    # Even if empty, we can inspect the columns
     expected = {
         "id",
         "flow_name",
@@ -54,7 +33,7 @@ def test_pipeline_runs_basic_columns(con):
         "gold_ml_max_date",
         "freshness_status",
     }
-    missing = expected - set(df.columns)
+    missing = expected - columns
     assert not missing, (
         f"pipeline_runs is missing expected columns: {missing}"
     )
@@ -64,23 +43,11 @@ def test_pipeline_runs_basic_columns(con):
 # pipeline_run_daily_summary
 # -------------------------------------------------------------------
 
-def test_pipeline_run_daily_summary_exists(con):
-    """
-    Ensure the daily pipeline run aggregation exists.
-    """
-    assert _table_or_view_exists(con, "pipeline_run_daily_summary"), (
-        "Expected table 'pipeline_run_daily_summary' to exist. "
-        "Run dbt observability models if this fails."
-    )
-
-
-def test_pipeline_run_daily_summary_columns(con):
+def test_pipeline_run_daily_summary_columns(warehouse_schema):
     """
     Check that pipeline_run_daily_summary has key summary fields.
     """
-    df = con.execute(
-        'SELECT * FROM "pipeline_run_daily_summary" LIMIT 1'
-    ).df()
+    schema = warehouse_schema.get("pipeline_run_daily_summary", {})
 
     expected_subset = {
         "run_date",
@@ -93,40 +60,26 @@ def test_pipeline_run_daily_summary_columns(con):
         "rows_bronze_delta_max",
         "rows_gold_ml_delta_max",
     }
-    missing = expected_subset - set(df.columns)
+    missing = expected_subset - schema.keys()
     assert not missing, (
         f"pipeline_run_daily_summary is missing expected columns: {missing}"
     )
 
     # Basic type sanity for run_date
-    if not df.empty:
-        assert pd.api.types.is_datetime64_any_dtype(df["run_date"]) or \
-               pd.api.types.is_object_dtype(df["run_date"]), (
-            "Expected run_date to be a date-like column."
-        )
+    assert is_date_like_type(schema["run_date"]), (
+        "Expected run_date to be a date-like column."
+    )
 
 
 # -------------------------------------------------------------------
 # pipeline_ml_daily_summary
 # -------------------------------------------------------------------
 
-def test_pipeline_ml_daily_summary_exists(con):
-    """
-    Ensure the ML observability daily summary exists.
-    """
-    assert _table_or_view_exists(con, "pipeline_ml_daily_summary"), (
-        "Expected table 'pipeline_ml_daily_summary' to exist. "
-        "Run dbt observability models if this fails."
-    )
-
-
-def test_pipeline_ml_daily_summary_columns(con):
+def test_pipeline_ml_daily_summary_columns(warehouse_schema):
     """
     Check that pipeline_ml_daily_summary exposes core ML metrics per day/mode.
     """
-    df = con.execute(
-        'SELECT * FROM "pipeline_ml_daily_summary" LIMIT 1'
-    ).df()
+    schema = warehouse_schema.get("pipeline_ml_daily_summary", {})
 
     expected_subset = {
         "run_date",
@@ -137,19 +90,18 @@ def test_pipeline_ml_daily_summary_columns(con):
         "avg_accuracy",
         "avg_roc_auc",
     }
-    missing = expected_subset - set(df.columns)
+    missing = expected_subset - schema.keys()
     assert not missing, (
         f"pipeline_ml_daily_summary is missing expected columns: {missing}"
     )
 
-    # If there is data, do a bit more sanity checking
-    if not df.empty:
-        assert pd.api.types.is_numeric_dtype(df["n_runs"]), (
-            "Expected n_runs to be numeric."
-        )
-        assert pd.api.types.is_numeric_dtype(df["avg_accuracy"]), (
-            "Expected avg_accuracy to be numeric."
-        )
-        assert pd.api.types.is_numeric_dtype(df["avg_roc_auc"]), (
-            "Expected avg_roc_auc to be numeric."
-        )
\ No newline at end of file
+    # Type sanity for the core metrics
+    assert is_numeric_type(schema["n_runs"]), (
+        "Expected n_runs to be numeric."
+    )
+    assert is_numeric_type(schema["avg_accuracy"]), (
+        "Expected avg_accuracy to be numeric."
+    )
+    assert is_numeric_type(schema["avg_roc_auc"]), (
+        "Expected avg_roc_auc to be numeric."
+    )
\ No newline at end of file
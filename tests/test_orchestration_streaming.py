@@ -0,0 +1,71 @@
+# tests/test_orchestration_streaming.py
+
+import logging
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("dbt.cli.main")  # prefect_flow runs dbt in-process
+
+from climate_pipeline.orchestration import prefect_flow  # noqa: E402
+
+
+# Writes partial lines across flushes on both pipes and ends each stream
+# without a trailing newline.
+_CHATTY_SCRIPT = r"""
+import sys, time
+sys.stdout.write("a\nb"); sys.stdout.flush()
+sys.stderr.write("err1\nerr-"); sys.stderr.flush()
+time.sleep(0.2)
+sys.stdout.write("c\nlast-no-newline"); sys.stdout.flush()
+sys.stderr.write("tail")
+"""
+
+
+def _stream(script: str, logger: logging.Logger):
+    with subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        tail = prefect_flow._stream_output(proc, logger)
+        proc.wait()
+    return list(tail)
+
+
+def _lines(tail, tag: str) -> list:
+    return [line for t, line in tail if t == tag]
+
+
+def test_stream_output_joins_partial_lines_and_flushes_at_eof(caplog) -> None:
+    """
+    Chunks that split a line are joined, and a final line without a
+    trailing newline is still emitted when its pipe reaches EOF.
+    """
+    logger = logging.getLogger("tests.stream_output")
+    caplog.set_level(logging.INFO, logger=logger.name)
+
+    tail = _stream(_CHATTY_SCRIPT, logger)
+
+    assert _lines(tail, "STDOUT") == [b"a", b"bc", b"last-no-newline"]
+    assert _lines(tail, "STDERR") == [b"err1", b"err-tail"]
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "STDOUT | bc" in messages
+    assert "STDERR | err-tail" in messages
+
+
+def test_stream_output_keeps_bounded_tail_without_info_logging(monkeypatch, caplog) -> None:
+    """
+    Only the last OUTPUT_TAIL_LINES lines are kept, and nothing is logged
+    per line when INFO is filtered out.
+    """
+    monkeypatch.setattr(prefect_flow, "OUTPUT_TAIL_LINES", 3)
+    logger = logging.getLogger("tests.stream_output.quiet")
+    caplog.set_level(logging.WARNING, logger=logger.name)
+
+    tail = _stream("for i in range(10): print(i)", logger)
+
+    assert tail == [("STDOUT", b"7"), ("STDOUT", b"8"), ("STDOUT", b"9")]
+    assert not caplog.records
@@ -0,0 +1,186 @@
+# tests/test_orchestration_worker.py
+
+import json
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from climate_pipeline.orchestration import worker
+from climate_pipeline.orchestration.worker import OUTPUT_DONE_MARKER
+
+
+# ==========================
+# worker: SystemExit -> return code
+# ==========================
+
+@pytest.mark.parametrize(
+    "exit_with, expected",
+    [
+        (None, 0),          # main() returns normally
+        (SystemExit(), 0),  # sys.exit()
+        (SystemExit(0), 0),
+        (SystemExit(3), 3),
+        (SystemExit("fatal: bad config"), 1),
+    ],
+)
+def test_call_main_translates_system_exit(exit_with, expected, capsys) -> None:
+    """
+    _call_main should turn a console-script main() into a return code, as
+    if it had run as its own process, and restore sys.argv afterwards.
+    """
+    seen_argv = []
+    argv_before = list(sys.argv)
+
+    def fake_main() -> None:
+        seen_argv.extend(sys.argv)
+        if exit_with is not None:
+            raise exit_with
+
+    assert worker._call_main("prog", fake_main, ["--flag", "x"]) == expected
+    assert seen_argv == ["prog", "--flag", "x"]
+    assert sys.argv == argv_before
+
+    if expected == 1:
+        assert "fatal: bad config" in capsys.readouterr().err
+
+
+def test_dispatch_unknown_op_and_exception(monkeypatch, capsys) -> None:
+    """
+    Unknown ops reply 2; an exception inside an op is reported and replies 1.
+    """
+    assert worker.dispatch("no-such-op", []) == 2
+    assert "Unknown worker op: no-such-op" in capsys.readouterr().err
+
+    def boom(args):
+        raise ValueError("kaboom")
+
+    monkeypatch.setitem(worker.OPS, "boom", boom)
+    assert worker.dispatch("boom", []) == 1
+    assert "ValueError: kaboom" in capsys.readouterr().err
+
+
+def test_dispatch_removes_handlers_added_by_op(monkeypatch) -> None:
+    """
+    Logging handlers an operation installs on the root logger are removed
+    afterwards, so repeated commands don't log every line twice.
+    """
+    root = logging.getLogger()
+    handlers_before = list(root.handlers)
+
+    def adds_handler(args):
+        root.addHandler(logging.StreamHandler(sys.stderr))
+        return 0
+
+    monkeypatch.setitem(worker.OPS, "adds-handler", adds_handler)
+    assert worker.dispatch("adds-handler", []) == 0
+    assert root.handlers == handlers_before
+
+
+# ==========================
+# worker: stdin/stdout protocol
+# ==========================
+
+def test_worker_protocol_replies_and_markers(project_root) -> None:
+    """
+    One JSON reply per non-blank command line on stdout, one output-done
+    marker per command on stderr, and nothing else on stdout, even when an
+    operation prints (argparse --help writes to stdout).
+    """
+    commands = [
+        "not json",
+        json.dumps({"args": []}),  # missing "op"
+        "",
+        json.dumps({"op": "no-such-op"}),
+        json.dumps({"op": "fetch-daily-weather", "args": ["--help"]}),
+    ]
+    proc = subprocess.run(
+        [sys.executable, "-m", "climate_pipeline.orchestration.worker"],
+        cwd=str(project_root),
+        input="\n".join(commands) + "\n",
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    replies = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert replies == [
+        {"op": None, "returncode": 2},
+        {"op": None, "returncode": 2},
+        {"op": "no-such-op", "returncode": 2},
+        {"op": "fetch-daily-weather", "returncode": 0},
+    ]
+
+    stderr_lines = proc.stderr.splitlines()
+    assert stderr_lines.count(OUTPUT_DONE_MARKER) == 4
+    assert any(line.startswith("usage:") for line in stderr_lines)
+
+
+# ==========================
+# WorkerClient (flow side)
+# ==========================
+
+@pytest.fixture
+def worker_client(monkeypatch, caplog):
+    """
+    A fresh WorkerClient whose run logger is a plain logging.Logger, so it
+    can be driven without a Prefect flow run. Closed after the test.
+    """
+    pytest.importorskip("dbt.cli.main")  # prefect_flow runs dbt in-process
+    from climate_pipeline.orchestration import prefect_flow
+
+    logger = logging.getLogger("tests.worker_client")
+    monkeypatch.setattr(prefect_flow, "get_run_logger", lambda: logger)
+    caplog.set_level(logging.INFO, logger=logger.name)
+
+    client = prefect_flow.WorkerClient()
+    yield client
+    client.close()
+
+
+def test_worker_client_success_forwards_output(worker_client, caplog) -> None:
+    """
+    A successful call returns normally, and the operation's output is
+    logged before call() returns (output-done marker handshake).
+    """
+    worker_client.call("fetch-daily-weather", ["--help"], description="help")
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("WORKER | usage:") for m in messages)
+    assert messages[-1] == "✅ Command succeeded with return code 0"
+
+
+def test_worker_client_failure_raises_with_tail(worker_client, caplog) -> None:
+    """
+    A non-zero reply raises CalledProcessError and logs the worker output
+    tail at ERROR; the worker itself stays up for the next call.
+    """
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        worker_client.call("fetch-daily-weather", ["--mode", "bogus"])
+    assert exc_info.value.returncode == 2
+
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert any("invalid choice" in m for m in errors)
+
+    pid = worker_client._proc.pid
+    worker_client.call("fetch-daily-weather", ["--help"])
+    assert worker_client._proc.pid == pid
+
+
+def test_worker_client_restarts_after_worker_death(worker_client) -> None:
+    """
+    If the worker process dies between calls, the next call starts a new one.
+    """
+    worker_client.call("fetch-daily-weather", ["--help"])
+    first = worker_client._proc
+    first.kill()
+    first.wait()
+
+    worker_client.call("fetch-daily-weather", ["--help"])
+    assert worker_client._proc is not first
+    assert worker_client._proc.poll() is None
+
+    worker_client.close()
+    assert worker_client._proc is None
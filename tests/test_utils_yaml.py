@@ -0,0 +1,41 @@
+# tests/test_utils_yaml.py
+
+from pathlib import Path
+
+from climate_pipeline.utils.load_yaml_with_env import load_yaml_with_env
+
+
+def _write_yaml(tmp_path: Path, text: str) -> str:
+    path = tmp_path / "settings.yaml"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_default_used_when_unset_or_empty(tmp_path: Path, monkeypatch) -> None:
+    """
+    ${VAR:-default} follows the shell: the default applies when VAR is
+    unset *or* set to an empty string.
+    """
+    path = _write_yaml(tmp_path, 'unset: "${UNSET_V:-dflt}"\nempty: "${EMPTY_V:-dflt}"\n')
+    monkeypatch.delenv("UNSET_V", raising=False)
+    monkeypatch.setenv("EMPTY_V", "")
+
+    assert load_yaml_with_env(path) == {"unset": "dflt", "empty": "dflt"}
+
+
+def test_set_value_wins_over_default(tmp_path: Path, monkeypatch) -> None:
+    path = _write_yaml(tmp_path, 'a: "${SET_V:-dflt}/raw"\nb: "${SET_V}/raw"\n')
+    monkeypatch.setenv("SET_V", "/data")
+
+    assert load_yaml_with_env(path) == {"a": "/data/raw", "b": "/data/raw"}
+
+
+def test_unset_var_without_default_left_as_written(tmp_path: Path, monkeypatch) -> None:
+    """
+    An unset ${VAR} with no default must not collapse to "" (which would
+    turn "${CLIMATE_DATA_ROOT}/raw" into a path at the filesystem root).
+    """
+    path = _write_yaml(tmp_path, 'raw_dir: "${UNSET_ROOT}/raw/open_meteo_daily"\n')
+    monkeypatch.delenv("UNSET_ROOT", raising=False)
+
+    assert load_yaml_with_env(path) == {"raw_dir": "${UNSET_ROOT}/raw/open_meteo_daily"}
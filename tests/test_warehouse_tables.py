@@ -0,0 +1,34 @@
+# tests/test_warehouse_tables.py
+
+import pytest
+
+
+# (layer, table or view) pairs the dbt project must produce.
+EXPECTED_TABLES = [
+    ("landing", "landing_daily_weather"),
+    ("clean", "clean_daily_weather_features"),
+    ("clean", "clean_monthly_climate"),
+    ("anomaly", "anomaly_city_month"),
+    ("anomaly", "anomaly_city_events"),
+    ("anomaly", "anomaly_city_lags"),
+    ("anomaly", "anomaly_city_correlations"),
+    ("ml", "ml_features"),
+    ("observability", "pipeline_runs"),
+    ("observability", "pipeline_run_daily_summary"),
+    ("observability", "pipeline_ml_daily_summary"),
+]
+
+
+@pytest.mark.parametrize(
+    "layer, name",
+    EXPECTED_TABLES,
+    ids=[f"{layer}-{name}" for layer, name in EXPECTED_TABLES],
+)
+def test_table_exists(layer, name, table_names):
+    """
+    Ensure every expected warehouse table/view exists. Uses the session-wide
+    table_names set, so each case is a single set lookup.
+    """
+    assert name in table_names, (
+        f"{layer} table/view '{name}' is missing — did dbt run?"
+    )